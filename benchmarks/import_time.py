@@ -0,0 +1,78 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from multiprocessing import Pipe, Process
+
+MODULES = [
+    "src.app.settings",
+    "src.app.lib.pixels.land_state",
+    "src.app.jobs.resource_hunter",
+    "src.app.cli.start_resource_hunter",
+    "src.app.cli.start_worker",
+    "src.app.cli.start_api",
+    "src.app.api.asgi",
+]
+
+
+def measure_import(module: str) -> float:
+    # a fresh interpreter per run, so nothing is already in sys.modules
+    started_at = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - started_at
+
+
+def _spawned_worker(conn):
+    import src.app.cli.start_worker  # noqa
+    import src.app.jobs.resource_hunter  # noqa
+
+    conn.send(time.perf_counter())
+
+
+def measure_worker_spawn() -> float:
+    # what every `start_worker` process pays before it can take its first job
+    parent_conn, child_conn = Pipe()
+    started_at = time.perf_counter()
+    (p := Process(target=_spawned_worker, args=(child_conn,))).start()
+    ready_at = parent_conn.recv()
+    p.join()
+    return ready_at - started_at
+
+
+def measure_api_cold_start() -> float:
+    started_at = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from src.app.api.asgi import app; app.openapi(); app.build_middleware_stack()",
+        ],
+        check=True,
+    )
+    return time.perf_counter() - started_at
+
+
+def report(name: str, samples: list[float]):
+    print(
+        f"{name:<40} median={statistics.median(samples) * 1000:8.1f}ms "
+        f"min={min(samples) * 1000:8.1f}ms max={max(samples) * 1000:8.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report("interpreter", [measure_import("sys") for _ in range(args.runs)])
+
+    for module in MODULES:
+        report(module, [measure_import(module) for _ in range(args.runs)])
+
+    report("worker spawn", [measure_worker_spawn() for _ in range(args.runs)])
+    report("api cold start", [measure_api_cold_start() for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import redis
+import websockets
+
+from .fake_pixels import FakePixelsServer
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Drives hunter -> worker -> redis -> api -> websocket against a fake Pixels server. "
+            "Needs the local redis (APP_REDIS_URL) and browser (APP_PW_WS_ENDPOINT) services."
+        )
+    )
+    parser.add_argument("--lands", type=int, default=200)
+    parser.add_argument("--duration", type=int, default=300, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("APP_CONCURRENCY", 1)))
+    parser.add_argument("--delay", type=float, default=0.5, help="fake page delay (seconds)")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--blocked-rate", type=float, default=0.1)
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument(
+        "--fake-host",
+        default="127.0.0.1",
+        help="host the browser uses to reach the fake server (host.docker.internal for docker)",
+    )
+    parser.add_argument("--api-port", type=int, default=9001)
+    parser.add_argument("--flush", action="store_true", help="FLUSHDB before starting")
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    return parser.parse_args()
+
+
+def read_proc_stats(pid: int) -> tuple[float, int]:
+    # cpu seconds (including waited children, e.g. rq work horses) and resident memory in bytes
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        rss_pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    except (FileNotFoundError, ProcessLookupError):
+        return 0.0, 0
+
+    utime, stime, cutime, cstime = map(int, fields[11:15])
+    return (utime + stime + cutime + cstime) / CLK_TCK, rss_pages * PAGE_SIZE
+
+
+def find_descendants(pid: int) -> list[tuple[int, int]]:
+    # (pid, parent pid) of every process below `pid`
+    parents: dict[int, int] = {}
+
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            parents[int(stat.parent.name)] = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (FileNotFoundError, ProcessLookupError, ValueError):
+            continue
+
+    result, pending = [], [pid]
+
+    while pending:
+        current = pending.pop()
+        children = [k for k, v in parents.items() if v == current]
+        result.extend((_, current) for _ in children)
+        pending.extend(children)
+
+    return result
+
+
+class ResourceSampler:
+    def __init__(self, processes: dict[str, subprocess.Popen]) -> None:
+        self._processes = processes
+        self.cpu: dict[str, float] = {name: 0.0 for name in processes}
+        self.peak_rss: dict[str, int] = {name: 0 for name in processes}
+        # pid -> (parent pid, highest cpu seconds seen), kept after the process exits
+        self._seen: dict[str, dict[int, tuple[int | None, float]]] = {
+            name: {} for name in processes
+        }
+
+    def sample(self):
+        for name, process in self._processes.items():
+            seen = self._seen[name]
+            alive, rss = set(), 0
+
+            for pid, parent in [(process.pid, None), *find_descendants(process.pid)]:
+                pid_cpu, pid_rss = read_proc_stats(pid)
+
+                if pid_cpu or pid_rss:
+                    alive.add(pid)
+                    seen[pid] = (parent, max(seen.get(pid, (None, 0.0))[1], pid_cpu))
+                    rss += pid_rss
+
+            # an exited process was reaped by its parent and is part of the parent's children
+            # cpu from then on; one whose parent is not tracked (yet) counts on its own
+            cpu = sum(c for pid, (p, c) in seen.items() if pid in alive or p not in seen)
+            self.cpu[name] = max(self.cpu[name], cpu)
+            self.peak_rss[name] = max(self.peak_rss[name], rss)
+
+
+def spawn(module: str, env: dict, *args: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", module, *args], env=env)
+
+
+async def wait_for_port(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            await asyncio.sleep(0.5)
+
+    raise TimeoutError(f"Nothing is listening on port {port}")
+
+
+async def consume_stream(url: str, latencies: list[float], received: dict[int, int]):
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send("1")
+
+        async for frame in ws:
+            message = json.loads(frame)["message"]
+
+            if message["type"] != "update":
+                continue
+
+            received[message["landNumber"]] = received.get(message["landNumber"], 0) + 1
+
+            if served_at := message["state"].get("_loadtest", {}).get("servedAt"):
+                latencies.append(time.time() * 1000 - served_at)
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    fake = FakePixelsServer(
+        ("0.0.0.0", args.fake_port),
+        delay=args.delay,
+        failure_rate=args.failure_rate,
+        blocked_rate=args.blocked_rate,
+    )
+    fake.start_in_background()
+
+    env = {
+        **os.environ,
+        "APP_PIXELS_BASE_URL": f"http://{args.fake_host}:{args.fake_port}",
+        "APP_RH_MAX_LANDS": str(args.lands),
+        "APP_PW_PROXY_ENABLED": "0",
+        "APP_CONCURRENCY": str(args.concurrency),
+        "API_PORT": str(args.api_port),
+        "API_SENTRY_DSN": "",
+        "WORKER_SENTRY_DSN": "",
+        "RH_SENTRY_DSN": "",
+    }
+    redis_client = redis.Redis.from_url(env["APP_REDIS_URL"])
+
+    if args.flush:
+        redis_client.flushdb()
+
+    processes = {"api": spawn("src.app.cli.start_api", env)}
+    latencies: list[float] = []
+    received: dict[int, int] = {}
+
+    try:
+        await wait_for_port(args.api_port)
+        consumer = asyncio.create_task(
+            consume_stream(
+                f"ws://127.0.0.1:{args.api_port}/lands/states/stream/", latencies, received
+            )
+        )
+        processes["worker"] = spawn("src.app.cli.start_worker", env)
+        processes["hunter"] = spawn("src.app.cli.start_resource_hunter", env)
+        sampler = ResourceSampler(processes)
+        started_at = time.monotonic()
+
+        while (elapsed := time.monotonic() - started_at) < args.duration:
+            if consumer.done():
+                consumer.result()
+
+            sampler.sample()
+            await asyncio.sleep(1)
+
+        consumer.cancel()
+    finally:
+        for process in processes.values():
+            process.terminate()
+
+        for process in processes.values():
+            process.wait(10)
+
+        fake.shutdown()
+
+    updates = sum(received.values())
+    return {
+        "lands": args.lands,
+        "duration": round(elapsed, 1),
+        "pagesServed": fake.served,
+        "pagesFailed": fake.failed,
+        "updates": updates,
+        "distinctLands": len(received),
+        "landsPerMinute": round(updates / elapsed * 60, 1),
+        "latencyMs": {f"p{p}": round(percentile(latencies, p), 1) for p in (50, 90, 95, 99)},
+        "cpuSeconds": {k: round(v, 1) for k, v in sampler.cpu.items()},
+        "peakRssMiB": {k: round(v / 2**20, 1) for k, v in sampler.peak_rss.items()},
+        "redisUsedMemoryMiB": round(redis_client.info("memory")["used_memory"] / 2**20, 1),
+    }
+
+
+def main():
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
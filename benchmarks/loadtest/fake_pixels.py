@@ -0,0 +1,128 @@
+import argparse
+import copy
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+EXAMPLE_STATE_PATH = Path(__file__).parents[2] / "docs" / "land-state-example.json"
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>Pixels (fake) #{land_number}</title></head>
+<body>
+<script>
+window.Phaser = {{Display: {{Canvas: {{CanvasPool: {{pool: [{{parent: {{game: {{scene: {{
+    scenes: [{{}}, {{stateManager: {{room: {{state: {state}}}}}}}]
+}}}}}}}}]}}}}}}}};
+</script>
+</body>
+</html>
+"""
+
+
+def load_example_state() -> dict:
+    return json.loads(EXAMPLE_STATE_PATH.read_text())["state"]
+
+
+def make_state(example: dict, land_number: int, *, blocked_rate: float) -> dict:
+    # same shape as the real state with the timers of every resource moved around "now"
+    state = copy.deepcopy(example)
+    now_ms = int(time.time() * 1000)
+    state["id"] = f"pixelsNFTFarm-{land_number}"
+    state["nft"]["tokenId"] = str(land_number)
+    state["permissions"]["use"] = ["OWNER"] if random.random() < blocked_rate else ["ANY"]
+    state["_loadtest"] = {"servedAt": now_ms}
+
+    for entity in state["entities"].values():
+        generic = entity.get("generic", {})
+
+        for static in generic.get("statics", []):
+            if static["name"] in ("lastChop", "lastTimer", "finishTime") and int(static["value"]):
+                static["value"] = str(now_ms + random.randint(-8 * 3600, 3600) * 1000)
+
+        if generic.get("utcRefresh"):
+            generic["utcRefresh"] = now_ms + random.randint(-3600, 8 * 3600) * 1000
+
+    return state
+
+
+class FakePixelsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, *, delay: float, failure_rate: float, blocked_rate: float):
+        super().__init__(address, FakePixelsHandler)
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.blocked_rate = blocked_rate
+        self.example = load_example_state()
+        self.served = 0
+        self.failed = 0
+
+    def start_in_background(self) -> threading.Thread:
+        (thread := threading.Thread(target=self.serve_forever, daemon=True)).start()
+        return thread
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FakePixelsHandler(BaseHTTPRequestHandler):
+    server: FakePixelsServer
+
+    def do_GET(self):
+        if not (match := re.fullmatch(r"/pixels/share/(\d+)/?", self.path.split("?")[0])):
+            return self._reply(404, "text/plain", b"not found")
+
+        if self.server.delay:
+            time.sleep(random.uniform(0.5, 1.5) * self.server.delay)
+
+        if random.random() < self.server.failure_rate:
+            self.server.failed += 1
+            return self._reply(503, "text/plain", b"unavailable")
+
+        state = make_state(
+            self.server.example, int(match.group(1)), blocked_rate=self.server.blocked_rate
+        )
+        page = PAGE_TEMPLATE.format(
+            land_number=match.group(1), state=json.dumps(state).replace("</", "<\\/")
+        )
+        self.server.served += 1
+        self._reply(200, "text/html; charset=utf-8", page.encode())
+
+    def _reply(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves fake Pixels land pages")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--delay", type=float, default=0.0, help="mean response delay (seconds)")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--blocked-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = FakePixelsServer(
+        (args.host, args.port),
+        delay=args.delay,
+        failure_rate=args.failure_rate,
+        blocked_rate=args.blocked_rate,
+    )
+    print(f"Serving fake Pixels pages on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
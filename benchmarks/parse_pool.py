@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import json
+import time
+
+from src.app.lib.pixels import land_state as ls
+
+from .loadtest.fake_pixels import load_example_state, make_state
+
+DISTINCT_STATES = 50
+
+
+def make_encoded_states(count: int) -> list[str]:
+    # cached values in the same format as redis; a few distinct states are cycled to bound memory
+    example = load_example_state()
+    distinct = [
+        ls.merge_fields(
+            f'{{"state": {json.dumps(make_state(example, i + 1, blocked_rate=0.1))}}}',
+            createdAt="2024-04-01 00:00:00",
+            expiresAt="2024-04-02 00:00:00",
+        )
+        for i in range(DISTINCT_STATES)
+    ]
+    return [distinct[i % DISTINCT_STATES] for i in range(count)]
+
+
+async def measure(name: str, run, states: list[str]):
+    # a ticker that should wake up every 10ms; how late it wakes up is the event loop stall
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - started_at - 0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.05)
+    started_at = time.perf_counter()
+    await run(states)
+    elapsed = time.perf_counter() - started_at
+    done.set()
+    await task
+    print(
+        f"  {name:<8} total={elapsed:7.2f}s lands/s={len(states) / elapsed:9.0f} "
+        f"max loop stall={max(stalls) * 1000:8.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    service = ls.ParsingService(args.workers, args.chunk_size)
+
+    async def inline(states: list[str]):
+        # what the bot used to do: parse every land in the event loop
+        for data in states:
+            ls.parse_encoded(data)
+
+    # start the workers up front so the spawn cost doesn't land on the first size
+    await service.parse_many(make_encoded_states(DISTINCT_STATES))
+
+    try:
+        for size in args.sizes:
+            states = make_encoded_states(size)
+            print(f"{size} lands")
+            await measure("inline", inline, states)
+            await measure("pool", service.parse_many, states)
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
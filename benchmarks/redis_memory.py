@@ -0,0 +1,78 @@
+import argparse
+import json
+import pickle
+import random
+import re
+import statistics
+from datetime import datetime
+
+import redis
+
+from src.app import settings
+
+KEYS = {
+    "state": "app:land:{}:state",
+    "job": "rq:job:app:land:{}:job",
+    "results": "rq:results:app:land:{}:job",
+}
+
+
+def memory_usage(client: redis.Redis, key: str) -> int:
+    return client.memory_usage(key, samples=0) or 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis bytes per land, by key")
+    parser.add_argument("--sample", type=int, default=200, help="lands to inspect")
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    land_numbers = [
+        int(re.search(rb"\d+", _).group(0)) for _ in client.scan_iter("app:land:*:state")
+    ]
+    land_numbers = random.sample(land_numbers, min(args.sample, len(land_numbers)))
+
+    if not land_numbers:
+        raise SystemExit("There is no land state cached")
+
+    usage = {name: [] for name in KEYS}
+    result_payloads = {"before (full state)": [], "after (summary)": []}
+
+    for land_number in land_numbers:
+        for name, template in KEYS.items():
+            usage[name].append(memory_usage(client, template.format(land_number)))
+
+        # what rq pickles as the job result, for the old and the new return value
+        cached = json.loads(client.get(KEYS["state"].format(land_number)))
+        created_at = datetime.fromisoformat(cached["createdAt"])
+        expires_at = datetime.fromisoformat(cached["expiresAt"])
+        full = {"createdAt": created_at, "expiresAt": expires_at, "state": cached["state"]}
+        summary = {
+            "landNumber": land_number,
+            "createdAt": created_at,
+            "expiresAt": expires_at,
+            "outcome": "synced",
+        }
+        result_payloads["before (full state)"].append(len(pickle.dumps(full)))
+        result_payloads["after (summary)"].append(len(pickle.dumps(summary)))
+
+    print(f"Lands inspected: {len(land_numbers)}\n")
+    print("Redis MEMORY USAGE per land (bytes)")
+
+    for name, values in usage.items():
+        print(f"  {name:<10} mean={statistics.mean(values):>10.0f} max={max(values):>10}")
+
+    print(f"  {'total':<10} mean={sum(statistics.mean(_) for _ in usage.values()):>10.0f}")
+    print("\nPickled job result per land (bytes; rq keeps up to 10 results per job id)")
+
+    for name, values in result_payloads.items():
+        print(f"  {name:<20} mean={statistics.mean(values):>10.0f}")
+
+    print(
+        f"\nFinished registry: {client.zcard('rq:finished:default')} jobs, "
+        f"failed registry: {client.zcard('rq:failed:default')} jobs"
+    )
+
+
+if __name__ == "__main__":
+    main()
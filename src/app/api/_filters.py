@@ -0,0 +1,116 @@
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from ..lib.pixels import land_state as ls
+from ._stream import ProtocolError, get_parsed
+
+MAX_LAND_NUMBER = 5000
+RESOURCE_TYPES = ("trees", "windmills", "wineries", "grills", "kilns")
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _parse_lands(lands) -> list[tuple[int, int]]:
+    if not isinstance(lands, list):
+        raise ProtocolError("lands must be a list of land numbers or [start, end]")
+
+    ranges = []
+
+    for item in lands:
+        if _is_int(item):
+            ranges.append((item, item))
+        elif isinstance(item, list) and len(item) == 2 and all(map(_is_int, item)):
+            if item[0] > item[1]:
+                raise ProtocolError(f"Invalid land range {item}, start is after end")
+            ranges.append((item[0], item[1]))
+        else:
+            raise ProtocolError(f"Invalid land {item!r}, expected a number or [start, end]")
+
+    return sorted(ranges)
+
+
+def get_resource_ready_at(resource: ls.LandResource) -> datetime | None:
+    if resource["entity"].startswith("ent_tree"):
+        if last_chop := resource.get("lastChop"):
+            return last_chop + timedelta(hours=7, minutes=15)
+        return None
+
+    return resource.get("finishTime")
+
+
+class LandFilter:
+    # {"lands": [[1, 100], 250], "resources": ["trees"], "readyWithin": 600, "excludeBlocked": true}
+    def __init__(self, spec: dict | None = None) -> None:
+        spec = spec or {}
+
+        if not isinstance(spec, dict):
+            raise ProtocolError("The subscription must be an object")
+
+        self.lands = _parse_lands(spec.get("lands") or [])
+        resources = spec.get("resources") or []
+
+        if not isinstance(resources, list) or not all(isinstance(_, str) for _ in resources):
+            raise ProtocolError("resources must be a list of resource types")
+        elif unknown := [_ for _ in resources if _ not in RESOURCE_TYPES]:
+            raise ProtocolError(f"Unknown resource types {unknown}")
+
+        self.resources = sorted(set(resources))
+
+        if (ready_within := spec.get("readyWithin")) is not None:
+            if not isinstance(ready_within, (int, float)) or isinstance(ready_within, bool):
+                raise ProtocolError("readyWithin must be a number of seconds")
+            elif not math.isfinite(ready_within) or ready_within < 0:
+                raise ProtocolError("readyWithin must be a finite, non negative number")
+
+        if not isinstance(exclude_blocked := spec.get("excludeBlocked", False), bool):
+            raise ProtocolError("excludeBlocked must be a boolean")
+
+        self.ready_within: int | float | None = ready_within
+        self.exclude_blocked = exclude_blocked
+        self.key = json.dumps([self.lands, self.resources, self.ready_within, self.exclude_blocked])
+
+    @property
+    def needs_parsing(self) -> bool:
+        return bool(self.resources or self.ready_within is not None or self.exclude_blocked)
+
+    def iter_land_numbers(self) -> Iterator[int]:
+        if not self.lands:
+            yield from range(1, MAX_LAND_NUMBER + 1)
+            return
+
+        last = 0
+
+        for start, end in self.lands:
+            yield from range(max(start, last + 1), min(end, MAX_LAND_NUMBER) + 1)
+            last = max(last, end)
+
+    def match_land_number(self, land_number: int) -> bool:
+        return not self.lands or any(a <= land_number <= b for a, b in self.lands)
+
+    def match(self, land_number: int, data: str) -> bool:
+        if not self.match_land_number(land_number):
+            return False
+        elif not self.needs_parsing:
+            return True
+
+        parsed = get_parsed(data, land_number)
+
+        if self.exclude_blocked and parsed["is_blocked"]:
+            return False
+        elif not self.resources and self.ready_within is None:
+            return True
+
+        deadline = datetime.now() + timedelta(seconds=self.ready_within or 0)
+
+        for resource_type in self.resources or RESOURCE_TYPES:
+            for resource in parsed[resource_type]:
+                if self.ready_within is None:
+                    return True
+                elif (ready_at := get_resource_ready_at(resource)) is None or ready_at <= deadline:
+                    return True
+
+        return False
@@ -0,0 +1,154 @@
+import asyncio
+from collections import OrderedDict, defaultdict, deque
+
+from .. import settings
+from ..lib.redis import create_redis_connection
+from ..lib.utils import get_logger
+from ._filters import LandFilter
+from ._stream import StreamProtocol, encode_frame, read_head
+
+logger = get_logger("app:api:stream")
+SNAPSHOT_BUFFER_SIZE = 16
+
+
+class StreamClient:
+    # Frames of the current snapshot are sent first, through a small buffer that makes the
+    # snapshot wait for the socket. Updates published meanwhile are held apart, the latest one
+    # per land, within API_CLIENT_BUFFER_MAX_BYTES, and sent once the snapshot is done.
+    def __init__(self, protocol: StreamProtocol, land_filter: LandFilter) -> None:
+        self.protocol = protocol
+        self.filter = land_filter
+        self.dropped = 0
+        # set once an update had to be dropped; the client's view is stale from then on and the
+        # connection is closed so it reconnects and gets a new snapshot
+        self.lagging = asyncio.Event()
+        self._snapshot: deque[str | bytes] = deque()
+        self._snapshot_done = True
+        self._updates: OrderedDict[int, str | bytes] = OrderedDict()
+        self._updates_size = 0
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+
+    def begin_snapshot(self, *frames: str | bytes):
+        # drops everything queued for the previous subscription; `frames` go out first
+        self._snapshot = deque(frames)
+        self._snapshot_done = False
+        self._updates.clear()
+        self._updates_size = 0
+        self._readable.set()
+        self._writable.set()
+
+    async def put_snapshot(self, frame: str | bytes):
+        while len(self._snapshot) >= SNAPSHOT_BUFFER_SIZE:
+            self._writable.clear()
+            await self._writable.wait()
+
+        self._snapshot.append(frame)
+        self._readable.set()
+
+    def end_snapshot(self):
+        self._snapshot_done = True
+        self._readable.set()
+
+    def push(self, land_number: int, frame: str | bytes):
+        if (previous := self._updates.pop(land_number, None)) is not None:
+            self._updates_size -= len(previous)
+
+        if self._updates_size + len(frame) > settings.API_CLIENT_BUFFER_MAX_BYTES:
+            if not self.lagging.is_set():
+                logger.warning(
+                    f"Stream client buffer is full, dropping updates ({self.filter.key})"
+                )
+                self.lagging.set()
+
+            self.dropped += 1
+            return
+
+        self._updates[land_number] = frame
+        self._updates_size += len(frame)
+        self._readable.set()
+
+    async def next_frame(self) -> str | bytes:
+        while True:
+            if self._snapshot:
+                self._writable.set()
+                return self._snapshot.popleft()
+            elif self._snapshot_done and self._updates:
+                frame = self._updates.popitem(last=False)[1]
+                self._updates_size -= len(frame)
+                return frame
+
+            self._readable.clear()
+            await self._readable.wait()
+
+
+class StreamHub:
+    # A single pub/sub subscription per process. Every update is matched once per distinct
+    # filter and encoded once per protocol, then fanned out to the clients' queues.
+    def __init__(self) -> None:
+        self._clients: set[StreamClient] = set()
+        self._task: asyncio.Task | None = None
+
+    def register(self, client: StreamClient):
+        self._clients.add(client)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, client: StreamClient):
+        self._clients.discard(client)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            try:
+                async with create_redis_connection() as redis:
+                    ps = redis.pubsub(ignore_subscribe_messages=True)
+                    await ps.subscribe("app:lands:states:channel")
+
+                    while True:
+                        if not (message := await ps.get_message(timeout=None)):
+                            continue
+
+                        try:
+                            self.dispatch(message["data"])
+                        except Exception as error:
+                            logger.error(f"stream hub dispatch: {error!r}")
+            except asyncio.CancelledError:
+                break
+            except Exception as error:
+                logger.error(f"stream hub: {error!r}")
+                await asyncio.sleep(1)
+
+    def dispatch(self, data: str):
+        land_number, _ = read_head(data)
+        by_filter: dict[str, list[StreamClient]] = defaultdict(list)
+        frames: dict[tuple, str | bytes | None] = {}
+
+        for client in self._clients:
+            by_filter[client.filter.key].append(client)
+
+        for filter_key, clients in by_filter.items():
+            try:
+                if not clients[0].filter.match(land_number, data):
+                    continue
+            except Exception as error:
+                logger.error(f"stream hub match {filter_key} land {land_number}: {error!r}")
+                continue
+
+            for client in clients:
+                if (key := tuple(client.protocol.values())) not in frames:
+                    try:
+                        frames[key] = encode_frame(client.protocol, "update", data)
+                    except Exception as error:
+                        logger.error(f"stream hub encode {key} land {land_number}: {error!r}")
+                        frames[key] = None
+
+                if (frame := frames[key]) is not None:
+                    client.push(land_number, frame)
+
+
+hub = StreamHub()
@@ -0,0 +1,220 @@
+import json
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Literal, TypedDict
+
+from .. import settings
+from ..lib.pixels import land_state as ls
+
+ENCODINGS = ("json", "msgpack", "cbor")
+PROJECTIONS = ("raw", "parsed")
+# cached values and pub/sub payloads always start with these fields, see `ls.to_cache`/`ls.publish`
+_HEAD_RE = re.compile(r'^\{(?:"landNumber": (\d+), )?"createdAt": "([^"]*)"')
+
+
+class StreamProtocol(TypedDict):
+    encoding: Literal["json", "msgpack", "cbor"]
+    projection: Literal["raw", "parsed"]
+
+
+LEGACY_PROTOCOL: StreamProtocol = {"encoding": "json", "projection": "raw"}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def parse_request(text: str) -> dict | None:
+    try:
+        request = json.loads(text)
+    except ValueError:
+        return None
+
+    return request if isinstance(request, dict) else None
+
+
+def parse_handshake(text: str) -> tuple[StreamProtocol, dict | None] | None:
+    # the legacy handshake is the literal "1"; anything else must be a JSON protocol request,
+    # optionally carrying the first subscription
+    if text == "1":
+        return LEGACY_PROTOCOL, None
+    elif (request := parse_request(text)) is None:
+        return None
+
+    protocol: StreamProtocol = {
+        "encoding": request.get("encoding", "json"),
+        "projection": request.get("projection", "raw"),
+    }
+
+    if protocol["encoding"] not in ENCODINGS:
+        raise ProtocolError(f"Unsupported encoding {protocol['encoding']!r}")
+    elif protocol["projection"] not in PROJECTIONS:
+        raise ProtocolError(f"Unsupported projection {protocol['projection']!r}")
+
+    try:
+        _get_encoder(protocol["encoding"])
+    except ImportError as error:
+        raise ProtocolError(f"Encoding {protocol['encoding']!r} is not available") from error
+
+    return protocol, request.get("subscribe")
+
+
+def _stringify_datetimes(obj):
+    if isinstance(obj, datetime):
+        return str(obj)
+    elif isinstance(obj, dict):
+        return {k: _stringify_datetimes(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_stringify_datetimes(_) for _ in obj]
+
+    return obj
+
+
+def _get_encoder(encoding: str):
+    if encoding == "msgpack":
+        import msgpack
+
+        return lambda obj: msgpack.packb(_stringify_datetimes(obj))
+    elif encoding == "cbor":
+        import cbor2
+
+        return lambda obj: cbor2.dumps(_stringify_datetimes(obj))
+
+    return lambda obj: json.dumps(obj, default=str)
+
+
+def _encode_fields(encoding: str, fields: dict) -> str | bytes:
+    # the entries of a map without its header, so more entries can be put in front of them
+    encode = _get_encoder(encoding)
+
+    if encoding == "json":
+        return ", ".join(f"{encode(k)}: {encode(v)}" for k, v in fields.items())
+
+    return b"".join(encode(k) + encode(v) for k, v in fields.items())
+
+
+def _map_header(encoding: str, size: int) -> bytes:
+    # msgpack fixmap / cbor map with the size in the initial byte, both good up to 15 entries
+    return bytes([(0x80 if encoding == "msgpack" else 0xA0) + size])
+
+
+def _wrap_message(encoding: str, kind: str, fields: str | bytes) -> str | bytes:
+    # {"message": {"type": kind, **fields}}, the same bytes as encoding the whole dict at once
+    if encoding == "json":
+        return f'{{"message": {{"type": {json.dumps(kind)}, {fields}}}}}'
+
+    encode = _get_encoder(encoding)
+    return (
+        _map_header(encoding, 1)
+        + encode("message")
+        + _map_header(encoding, _MESSAGE_FIELDS + 1)
+        + encode("type")
+        + encode(kind)
+        + fields
+    )
+
+
+class FrameCache:
+    # encoded messages keyed by land, state version and protocol; every client sending the same
+    # land version with the same protocol reuses the message encoded for the first one, the
+    # message type ("cached" or "update") is added around it by `_wrap_message`
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._frames: OrderedDict[tuple, str | bytes] = OrderedDict()
+
+    def get(self, key: tuple) -> str | bytes | None:
+        if (frame := self._frames.get(key)) is not None:
+            self._frames.move_to_end(key)
+
+        return frame
+
+    def put(self, key: tuple, frame: str | bytes):
+        if (old := self._frames.pop(key, None)) is not None:
+            self._size -= len(old)
+
+        self._frames[key] = frame
+        self._size += len(frame)
+
+        while self._size > self._max_bytes and self._frames:
+            self._size -= len(self._frames.popitem(last=False)[1])
+
+
+frame_cache = FrameCache(settings.API_FRAMES_CACHE_MAX_BYTES)
+parsing = ls.ParsingService()
+# landNumber, createdAt, expiresAt and either state or resources, see `encode_frame`
+_MESSAGE_FIELDS = 4
+_parsed_cache: OrderedDict[tuple[int, str], ls.ParsedLandState] = OrderedDict()
+_PARSED_CACHE_SIZE = 10000
+
+
+def read_head(data: str, land_number: int | None = None) -> tuple[int, str]:
+    # land number and version (createdAt) of a cached value or pub/sub payload, without decoding
+    if not (head := _HEAD_RE.match(data)):
+        raise ValueError("Unexpected land state payload")
+
+    return land_number or int(head.group(1)), head.group(2)
+
+
+def _put_parsed(key: tuple[int, str], parsed: ls.ParsedLandState):
+    _parsed_cache[key] = parsed
+
+    if len(_parsed_cache) > _PARSED_CACHE_SIZE:
+        _parsed_cache.popitem(last=False)
+
+
+def get_parsed(data: str, land_number: int | None = None) -> ls.ParsedLandState:
+    key = read_head(data, land_number)
+
+    if (parsed := _parsed_cache.get(key)) is not None:
+        _parsed_cache.move_to_end(key)
+        return parsed
+
+    _put_parsed(key, parsed := ls.parse_encoded(data))
+    return parsed
+
+
+async def load_parsed(states: list[tuple[int, str]]):
+    # parses the (land number, cached value) pairs missing from the parsed cache in the process
+    # pool, so bulk work like a snapshot does not block the event loop in `get_parsed`
+    keys = [read_head(data, land_number) for land_number, data in states]
+
+    if missing := [(k, data) for k, (_, data) in zip(keys, states) if k not in _parsed_cache]:
+        for (key, _), parsed in zip(
+            missing, await parsing.parse_many([data for _, data in missing])
+        ):
+            _put_parsed(key, parsed)
+
+
+def encode_frame(
+    protocol: StreamProtocol, kind: str, data: str, land_number: int | None = None
+) -> str | bytes:
+    land_number, version = read_head(data, land_number)
+
+    if protocol == LEGACY_PROTOCOL:
+        # the payload already is the JSON the client expects; wrap it without decoding
+        if data.startswith('{"landNumber"'):
+            return f'{{"message": {ls.merge_fields(data, type=kind)}}}'
+        return f'{{"message": {ls.merge_fields(data, type=kind, landNumber=land_number)}}}'
+
+    key = (land_number, version, protocol["encoding"], protocol["projection"])
+
+    if (fields := frame_cache.get(key)) is not None:
+        return _wrap_message(protocol["encoding"], kind, fields)
+
+    cached: ls.CachedLandState = json.loads(data)
+    message = {
+        "landNumber": land_number,
+        "createdAt": cached["createdAt"],
+        "expiresAt": cached["expiresAt"],
+    }
+
+    if protocol["projection"] == "parsed":
+        message["resources"] = get_parsed(data, land_number)
+    else:
+        message["state"] = cached["state"]
+
+    fields = _encode_fields(protocol["encoding"], message)
+    frame_cache.put(key, fields)
+    return _wrap_message(protocol["encoding"], kind, fields)
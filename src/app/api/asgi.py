@@ -1,15 +1,26 @@
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from ..lib.utils import init_sentry
+from ._hub import hub
+from ._stream import parsing
 from .router import router
 
+# here rather than in start_api: with --reload the app is served by a child process that
+# imports this module but never runs start_api.main
+if API_SENTRY_DSN := os.getenv("API_SENTRY_DSN"):
+    init_sentry(API_SENTRY_DSN)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     yield
+    await hub.close()
+    parsing.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
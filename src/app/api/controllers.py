@@ -1,19 +1,58 @@
+import asyncio
 import json
+import secrets
 
-from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import Header, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
+from .. import settings
+from ..lib import profiling
 from ..lib.pixels import land_state as ls
 from ..lib.redis import create_redis_connection
+from ..lib.utils import get_logger
+from ._filters import LandFilter
+from ._hub import StreamClient, hub
+from ._stream import (
+    LEGACY_PROTOCOL,
+    ProtocolError,
+    encode_frame,
+    load_parsed,
+    parse_handshake,
+    parse_request,
+)
+
+logger = get_logger("app:api")
 
 
 async def get_land_state(land_number: int):
     async with create_redis_connection() as redis:
-        if cached := await ls.from_cache(land_number, redis=redis):
-            return cached
+        if cached := await ls.from_cache_raw(land_number, redis=redis):
+            return Response(cached, media_type="application/json")
 
     raise HTTPException(404, "There is no state cached for this land.")
 
 
+def check_profiling_token(authorization: str = Header("")):
+    expected = f"Bearer {settings.PROFILING_TOKEN}"
+
+    if not secrets.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(401, "Invalid profiling token.")
+
+
+def get_profile(name: str):
+    return PlainTextResponse(profiling.get_collapsed_stacks(name))
+
+
+def set_profile_rate(name: str, every: int):
+    profiling.set_every(name, every)
+    return {"name": name, "every": profiling.get_every(name)}
+
+
+def reset_profile(name: str):
+    profiling.reset(name)
+    return {"name": name, "every": profiling.get_every(name)}
+
+
 async def stream_lands_states(websocket: WebSocket):
     try:
         await _stream_lands_states(websocket)
@@ -21,26 +60,109 @@ async def stream_lands_states(websocket: WebSocket):
         pass
 
 
+async def _send_error(websocket: WebSocket, error: Exception):
+    await websocket.send_json({"message": {"type": "error", "detail": str(error)}})
+
+
+async def _negotiate_protocol(websocket: WebSocket) -> StreamClient | None:
+    while True:
+        try:
+            if not (handshake := parse_handshake(await websocket.receive_text())):
+                continue
+
+            protocol, subscription = handshake
+            client = StreamClient(protocol, LandFilter(subscription))
+        except ProtocolError as error:
+            await _send_error(websocket, error)
+            await websocket.close(1003)
+            return None
+
+        if protocol is not LEGACY_PROTOCOL:
+            await websocket.send_json({"message": {"type": "hello", **protocol}})
+
+        return client
+
+
+async def _send_frames(websocket: WebSocket, client: StreamClient):
+    while not client.lagging.is_set():
+        if isinstance(frame := await client.next_frame(), bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+    await websocket.close(1013, f"Too slow, {client.dropped} updates were dropped")
+
+
+async def _send_snapshot(client: StreamClient):
+    land_filter = client.filter
+
+    try:
+        async with create_redis_connection() as redis:
+            land_numbers = [*land_filter.iter_land_numbers()]
+
+            for i in range(0, len(land_numbers), 100):
+                chunk = land_numbers[i : i + 100]
+                states = await redis.mget([f"app:land:{_}:state" for _ in chunk])
+                found = [(n, state) for n, state in zip(chunk, states) if state]
+
+                if land_filter.needs_parsing or client.protocol["projection"] == "parsed":
+                    await load_parsed(found)
+
+                for land_number, state in found:
+                    if client.filter is not land_filter:
+                        # the subscription changed; a new snapshot is on its way
+                        return
+                    elif land_filter.match(land_number, state):
+                        await client.put_snapshot(
+                            encode_frame(client.protocol, "cached", state, land_number)
+                        )
+
+                    await asyncio.sleep(0)
+    except Exception as error:
+        logger.error(f"snapshot {land_filter.key}: {error!r}")
+        await client.put_snapshot(
+            json.dumps({"message": {"type": "error", "detail": "The snapshot could not be sent"}})
+        )
+
+    # the updates held back during the snapshot are sent from here on
+    client.end_snapshot()
+
+
 async def _stream_lands_states(websocket: WebSocket):
     await websocket.accept()
 
-    while (await websocket.receive_text()) != "1":
-        continue
+    if not (client := await _negotiate_protocol(websocket)):
+        return
 
-    async with create_redis_connection() as redis:
-        for i in range(5000):
-            if state := await ls.from_cache(i + 1, redis=redis):
-                await websocket.send_json(
-                    {"message": {"type": "cached", "landNumber": i + 1, **state}}
-                )
-
-        ps = redis.pubsub(ignore_subscribe_messages=True)
-        await ps.subscribe("app:lands:states:channel")
+    client.begin_snapshot()
+    sender = asyncio.create_task(_send_frames(websocket, client))
+    snapshot = asyncio.create_task(_send_snapshot(client))
+    hub.register(client)
 
+    try:
         while True:
-            if not (message := await ps.get_message(timeout=None)):
+            if not (request := parse_request(await websocket.receive_text())):
+                continue
+            elif "subscribe" not in request:
+                continue
+
+            try:
+                land_filter = LandFilter(request["subscribe"])
+            except ProtocolError as error:
+                await _send_error(websocket, error)
                 continue
 
-            await websocket.send_json(
-                {"message": {"type": "update", **json.loads(message["data"])}}
+            # frames queued for the previous subscription are dropped and the ack leads the new
+            # snapshot, so nothing matching the old filter is sent after it
+            snapshot.cancel()
+            client.filter = land_filter
+            client.begin_snapshot(
+                json.dumps(
+                    {"message": {"type": "subscribed", "subscription": request["subscribe"]}}
+                )
             )
+            snapshot = asyncio.create_task(_send_snapshot(client))
+    finally:
+        hub.unregister(client)
+        sender.cancel()
+        snapshot.cancel()
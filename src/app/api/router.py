@@ -1,7 +1,16 @@
+from fastapi import Depends
 from fastapi.routing import APIRouter
 
+from .. import settings
 from . import controllers as ctrls
 
 router = APIRouter()
 router.get("/land/{land_number:int}/state/")(ctrls.get_land_state)
 router.websocket("/lands/states/stream/")(ctrls.stream_lands_states)
+
+if settings.PROFILING_TOKEN:
+    profiling_router = APIRouter(dependencies=[Depends(ctrls.check_profiling_token)])
+    profiling_router.get("/profiling/{name}/")(ctrls.get_profile)
+    profiling_router.put("/profiling/{name}/")(ctrls.set_profile_rate)
+    profiling_router.delete("/profiling/{name}/")(ctrls.reset_profile)
+    router.include_router(profiling_router)
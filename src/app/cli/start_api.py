@@ -1,15 +1,9 @@
 import argparse
 import os
 
-import sentry_sdk
 import uvicorn
 
-if API_SENTRY_DSN := os.getenv("API_SENTRY_DSN"):
-    sentry_sdk.init(
-        dsn=API_SENTRY_DSN,
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
-    )
+from .. import settings
 
 
 def parse_args() -> argparse.Namespace:
@@ -20,8 +14,16 @@ def parse_args() -> argparse.Namespace:
 
 def main():
     args = parse_args()
+
     port = int(os.getenv("API_PORT", 9000))
-    uvicorn.run("src.app.api.asgi:app", port=port, host="0.0.0.0", reload=args.reload)
+    uvicorn.run(
+        "src.app.api.asgi:app",
+        port=port,
+        host="0.0.0.0",
+        reload=args.reload,
+        ws="websockets",
+        ws_per_message_deflate=settings.API_WS_PER_MESSAGE_DEFLATE,
+    )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 from ... import settings
-from ._core import create_discord_client, logger
+from ...lib.utils import get_logger
+
+logger = get_logger("app:discord-bot")
 
 
 def main():
@@ -15,6 +17,9 @@ def main():
                 "The APP_DISCORD_BOT_TRACK_INDUSTRIES_CHANNEL_ID env variable is not defined."
             )
 
+        # discord.py is only imported once the configuration is known to be valid
+        from ._core import create_discord_client
+
         client = create_discord_client()
         client.run(settings.DISCORD_BOT_TOKEN)
     except Exception as error:
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypedDict
+
+import discord
+
+# https://discord.com/developers/docs/resources/channel#embed-object-embed-limits
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_TITLE_LIMIT = 256
+MESSAGE_EMBEDS_LIMIT = 10
+MESSAGE_EMBEDS_CHARS_LIMIT = 6000
+
+
+class SendQueueStats(TypedDict):
+    sent: int
+    rate_limited: int
+    latency_avg: float
+    latency_max: float
+
+
+class RateLimitCounter(logging.Handler):
+    # counts the 429 responses discord.py absorbs by sleeping internally
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+        self.last_retry_after = 0.0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.msg, str) and record.msg.startswith("We are being rate limited"):
+            self.count += 1
+            self.last_retry_after = float(record.args[-1]) if record.args else 0.0
+
+
+class SendQueue:
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._latencies: deque[float] = deque(maxlen=500)
+        self._sent = 0
+        self._rate_limited = 0
+        self._counter = RateLimitCounter()
+        logging.getLogger("discord.http").addHandler(self._counter)
+
+    async def _acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated_at) * self._rate
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def submit(self, request: Callable[[], Awaitable]):
+        while True:
+            await self._acquire()
+            absorbed = self._counter.count
+            started_at = time.monotonic()
+
+            try:
+                result = await request()
+            except discord.RateLimited as error:
+                self._rate_limited += 1
+                self._pause(error.retry_after)
+                continue
+            finally:
+                self._latencies.append(time.monotonic() - started_at)
+
+            if (absorbed := self._counter.count - absorbed) > 0:
+                # discord.py already slept through it; slow down the following requests as well
+                self._rate_limited += absorbed
+                self._pause(self._counter.last_retry_after)
+
+            self._sent += 1
+            return result
+
+    def close(self):
+        logging.getLogger("discord.http").removeHandler(self._counter)
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    def stats(self) -> SendQueueStats:
+        latencies = self._latencies or [0.0]
+        return {
+            "sent": self._sent,
+            "rate_limited": self._rate_limited,
+            "latency_avg": sum(latencies) / len(latencies),
+            "latency_max": max(latencies),
+        }
+
+
+def chunk_lines(lines: list[str], limit: int = EMBED_DESCRIPTION_LIMIT) -> list[str]:
+    chunks, current, size = [], [], 0
+
+    for line in lines:
+        line = line[:limit]
+
+        if current and size + len(line) + 1 > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+
+        current.append(line)
+        size += len(line) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
+
+
+def build_pages(title: str, lines: list[str]) -> list[list[discord.Embed]]:
+    descriptions = chunk_lines(lines) or ["Nothing to show right now."]
+    pages: list[list[discord.Embed]] = [[]]
+    page_size = 0
+
+    for i, description in enumerate(descriptions):
+        embed = discord.Embed(
+            title=f"{title} ({i + 1}/{len(descriptions)})"[:EMBED_TITLE_LIMIT],
+            description=description,
+        )
+        embed_size = len(embed.title) + len(description)
+
+        if pages[-1] and (
+            len(pages[-1]) >= MESSAGE_EMBEDS_LIMIT
+            or page_size + embed_size > MESSAGE_EMBEDS_CHARS_LIMIT
+        ):
+            pages.append([])
+            page_size = 0
+
+        pages[-1].append(embed)
+        page_size += embed_size
+
+    return pages
+
+
+def digest_page(page: list[discord.Embed]) -> str:
+    data = json.dumps([_.to_dict() for _ in page], sort_keys=True)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+class Board:
+    def __init__(self, channel: discord.TextChannel, title: str, queue: SendQueue) -> None:
+        self._channel = channel
+        self._title = title
+        self._queue = queue
+        self._messages: list[discord.Message] = []
+        self._digests: list[str | None] = []
+
+    async def load(self, author: discord.abc.Snowflake):
+        pins = await self._queue.submit(self._channel.pins)
+        self._messages = sorted(
+            [_ for _ in pins if _.author.id == author.id and _.embeds],
+            key=lambda _: _.created_at,
+        )
+        self._digests = [None] * len(self._messages)
+
+    async def update(self, lines: list[str]):
+        pages = build_pages(self._title, lines)
+
+        for i, page in enumerate(pages):
+            digest = digest_page(page)
+
+            if i < len(self._messages):
+                if self._digests[i] == digest:
+                    continue
+
+                message = self._messages[i]
+                self._messages[i] = await self._queue.submit(lambda: message.edit(embeds=page))
+                self._digests[i] = digest
+            else:
+                message = await self._queue.submit(lambda: self._channel.send(embeds=page))
+                await self._queue.submit(message.pin)
+                self._messages.append(message)
+                self._digests.append(digest)
+
+        while len(self._messages) > len(pages):
+            message = self._messages.pop()
+            self._digests.pop()
+            await self._queue.submit(message.delete)
@@ -1,6 +1,5 @@
 import asyncio
 import re
-from datetime import timedelta
 
 import discord
 from discord import app_commands
@@ -9,9 +8,11 @@ from ... import settings
 from ...lib.pixels import land_state as ls
 from ...lib.redis import create_redis_connection
 from ...lib.utils import get_logger
-from ._utils import filter_resources, format_land_resources_message
+from ._board import Board, SendQueue
+from ._utils import format_land_resources_message, format_watched_land
 
 logger = get_logger("app:discord-bot")
+WATCHER_BATCH_SIZE = 1000
 
 
 class Client(discord.Client):
@@ -19,9 +20,28 @@ class Client(discord.Client):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(intents=intents)
+        self._parsing = ls.ParsingService()
+        self._watcher: asyncio.Task | None = None
+
+        if settings.DISCORD_BOT_BOARD_MODE:
+            self._send_queue = SendQueue(
+                settings.DISCORD_BOT_SEND_RATE, settings.DISCORD_BOT_SEND_BURST
+            )
+
+    async def close(self):
+        await super().close()
+        self._parsing.shutdown()
+
+        if settings.DISCORD_BOT_BOARD_MODE:
+            self._send_queue.close()
 
     async def on_ready(self):
         logger.info(f"We have logged in as {self.user}")
+
+        # on_ready fires again after every gateway reconnect
+        if self._watcher is not None:
+            return
+
         self._guild = await self.fetch_guild(settings.DISCORD_BOT_GUILD_ID)
         self._trees_tracker_channel = await self._guild.fetch_channel(
             settings.DISCORD_BOT_TRACK_TREES_CHANNEL_ID
@@ -29,11 +49,18 @@ class Client(discord.Client):
         self._industries_tracker_channel = await self._guild.fetch_channel(
             settings.DISCORD_BOT_TRACK_INDUSTRIES_CHANNEL_ID
         )
+        if settings.DISCORD_BOT_BOARD_MODE:
+            self._trees_board = Board(self._trees_tracker_channel, "🌲 Trees", self._send_queue)
+            self._industries_board = Board(
+                self._industries_tracker_channel, "🏭 Industries", self._send_queue
+            )
+            await self._trees_board.load(self.user)
+            await self._industries_board.load(self.user)
         self._cmd_tree = app_commands.CommandTree(self)
         self._cmd_tree.command(name="resources")(self.send_land_available_resources)
         self._cmd_tree.copy_global_to(guild=self._guild)
         await self._cmd_tree.sync(guild=self._guild)
-        asyncio.create_task(self.resource_watcher())
+        self._watcher = asyncio.create_task(self.resource_watcher())
 
     async def send_land_available_resources(interaction: discord.Interaction, land_number: int):
         try:
@@ -63,21 +90,26 @@ class Client(discord.Client):
                 try:
                     keys = await redis.keys("app:land:*:state")
                     land_numbers = sorted([int(re.search("\d+", _).group(0)) for _ in keys])
-                    states = [
-                        ls.parse((await ls.from_cache(_, redis=redis))["state"])
-                        for _ in land_numbers
-                    ]
+                    messages = []
 
-                    for state in states:
-                        if state["is_blocked"]:
-                            continue
+                    for i in range(0, len(land_numbers), WATCHER_BATCH_SIZE):
+                        batch = land_numbers[i : i + WATCHER_BATCH_SIZE]
+                        cached = await redis.mget([f"app:land:{_}:state" for _ in batch])
+                        messages += await self._parsing.map(
+                            format_watched_land, [_ for _ in cached if _]
+                        )
 
-                        for tree in state["trees"]:
-                            tree["utcRefresh"] = tree["lastChop"] + timedelta(hours=7, minutes=15)
+                    trees_lines, industries_lines = [], []
 
-                        _state = filter_resources(state, 30, 180)
+                    for fmtd_message in messages:
+                        if not fmtd_message:
+                            continue
 
-                        if not (fmtd_message := format_land_resources_message(_state)):
+                        if settings.DISCORD_BOT_BOARD_MODE:
+                            trees_lines.extend(filter(bool, fmtd_message["trees"].split("\n")))
+                            industries_lines.extend(
+                                filter(bool, fmtd_message["indutries"].split("\n"))
+                            )
                             continue
 
                         if fmtd_message["trees"]:
@@ -86,6 +118,11 @@ class Client(discord.Client):
                         if fmtd_message["indutries"]:
                             await self._industries_tracker_channel.send(fmtd_message["indutries"])
 
+                    if settings.DISCORD_BOT_BOARD_MODE:
+                        await self._trees_board.update(trees_lines)
+                        await self._industries_board.update(industries_lines)
+                        logger.info(f"Board updated: {self._send_queue.stats()}")
+
                     await asyncio.sleep(150)
                 except asyncio.CancelledError:
                     break
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Callable, Iterable, TypedDict
 
 from ...lib.pixels import land_state as ls
@@ -75,6 +75,19 @@ def format_land_resources_message(parsed_state: ls.ParsedLandState) -> FormatedL
     }
 
 
+def format_watched_land(data: str) -> FormatedLandResources | None:
+    # runs in the parsing service workers; `data` is the land state as cached in redis
+    state = ls.parse_encoded(data)
+
+    if state["is_blocked"]:
+        return None
+
+    for tree in state["trees"]:
+        tree["utcRefresh"] = tree["lastChop"] + timedelta(hours=7, minutes=15)
+
+    return format_land_resources_message(filter_resources(state, 30, 180))
+
+
 def extract_items(it: list[dict], predicate: Callable[[dict], None]):
     results = []
     while (i := 0) < len(it):
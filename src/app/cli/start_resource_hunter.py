@@ -1,28 +1,40 @@
+import json
+import math
 import os
+import socket
+import threading
 from datetime import datetime
 from time import sleep
+from typing import TYPE_CHECKING
+from uuid import uuid4
 
 import rq
-import rq.registry
-import sentry_sdk
-from playwright.async_api import ProxySettings
+from redis import Redis as RedisSync
 from rq.job import JobStatus
 
 from .. import settings
 from ..jobs import resource_hunter as rh
+from ..lib.lease import Lease
 from ..lib.proxy import create_proxy_yielder
-from ..lib.utils import get_logger
+from ..lib.utils import get_logger, init_sentry
+
+if TYPE_CHECKING:
+    from playwright.async_api import ProxySettings
 
 logger = get_logger("app:resource-hunter")
-MAX_LANDS_TO_SCAN = 5000
+MAX_LANDS_TO_SCAN = settings.RH_MAX_LANDS
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
 
 
-def enqueue_job(land_number: int, *, proxy: ProxySettings = None) -> rq.job.Job | None:
-    if not (job := rh.queue.fetch_job(f"app:land:{land_number}:job")):
+def enqueue_job(land_number: int, *, proxy: "ProxySettings" = None) -> rq.job.Job | None:
+    if not (job := rh.get_queue().fetch_job(f"app:land:{land_number}:job")):
         job = rh.enqueue(land_number, proxy=proxy)
         return job
     elif (job_status := job.get_status()) == JobStatus.FINISHED:
-        expires_at: datetime = job.result["expiresAt"]
+        if not (summary := job.return_value()):
+            return rh.enqueue(land_number, proxy=proxy)
+
+        expires_at: datetime = summary["expiresAt"]
 
         if int((expires_at - datetime.now()).total_seconds()) > 0:
             return None
@@ -32,12 +44,111 @@ def enqueue_job(land_number: int, *, proxy: ProxySettings = None) -> rq.job.Job
         return rh.enqueue(land_number, proxy=proxy)
 
 
-def _main():
+def get_shard_lands(shard: int) -> range:
+    size = math.ceil(MAX_LANDS_TO_SCAN / settings.RH_SHARDS)
+    return range(shard * size + 1, min((shard + 1) * size, MAX_LANDS_TO_SCAN) + 1)
+
+
+class ShardCoordinator:
+    # Every hunter instance heartbeats into a sorted set; each one claims at most its fair share
+    # of the shards and a shard whose owner stops renewing the lease is taken over by another.
+    def __init__(self, redis: RedisSync) -> None:
+        self._redis = redis
+        self._leases = {
+            shard: Lease(
+                redis, f"app:hunter:shard:{shard}:lease", INSTANCE_ID, settings.RH_LEASE_TTL
+            )
+            for shard in range(settings.RH_SHARDS)
+        }
+        self._owned: set[int] = set()
+        self._lock = threading.Lock()
+
+    def owned(self) -> list[int]:
+        with self._lock:
+            return sorted(self._owned)
+
+    def owns(self, shard: int) -> bool:
+        with self._lock:
+            return shard in self._owned
+
+    def heartbeat(self):
+        now_ms = int(datetime.now().timestamp() * 1000)
+        self._redis.zadd("app:hunter:instances", {INSTANCE_ID: now_ms})
+        self._redis.zremrangebyscore("app:hunter:instances", 0, now_ms - settings.RH_LEASE_TTL)
+        fair_share = math.ceil(
+            settings.RH_SHARDS / max(1, self._redis.zcard("app:hunter:instances"))
+        )
+
+        with self._lock:
+            for shard in [*self._owned]:
+                if not self._leases[shard].renew():
+                    logger.warning(f"Lost the lease of shard {shard}")
+                    self._owned.discard(shard)
+
+            while len(self._owned) > fair_share:
+                self._leases[shard := max(self._owned)].release()
+                self._owned.discard(shard)
+                logger.info(f"Released shard {shard}")
+
+            for shard, lease in self._leases.items():
+                if len(self._owned) >= fair_share:
+                    break
+                elif shard not in self._owned and lease.acquire():
+                    self._owned.add(shard)
+                    logger.info(f"Claimed shard {shard}")
+
+    def release_all(self):
+        with self._lock:
+            for shard in self._owned:
+                self._leases[shard].release()
+            self._owned.clear()
+
+        self._redis.zrem("app:hunter:instances", INSTANCE_ID)
+
+    def start_heartbeat(self) -> threading.Thread:
+        def loop():
+            while True:
+                try:
+                    self.heartbeat()
+                except Exception as error:
+                    logger.error(f"heartbeat: {error!r}")
+
+                sleep(settings.RH_LEASE_TTL / 3000)
+
+        (thread := threading.Thread(target=loop, daemon=True)).start()
+        return thread
+
+
+def publish_shard_progress(redis: RedisSync, shard: int, scanned: int, enqueued: int):
+    key = f"app:hunter:shard:{shard}:progress"
+    now = datetime.now()
+
+    if last_pass_at := redis.hget(key, "lastPassAt"):
+        lag = int((now - datetime.fromisoformat(last_pass_at.decode())).total_seconds())
+    else:
+        lag = 0
+
+    progress = {
+        "shard": shard,
+        "owner": INSTANCE_ID,
+        "scanned": scanned,
+        "enqueued": enqueued,
+        "lag": lag,
+        "lastPassAt": now.isoformat(),
+    }
+    redis.hset(key, mapping=progress)
+    redis.publish("app:hunter:progress:channel", json.dumps(progress))
+
+
+def _main(coordinator: ShardCoordinator, redis: RedisSync):
     while True:
         sleep(2)
 
-        if rh.queue.count > 0:
-            logger.info(f"There is {rh.queue.count} jobs left to handle")
+        if (count := rh.get_queue().count) > 0:
+            logger.info(f"There is {count} jobs left to handle")
+            continue
+
+        if not (shards := coordinator.owned()):
             continue
 
         if settings.PW_PROXY_ENABLED:
@@ -45,22 +156,30 @@ def _main():
         else:
             get_proxy = lambda: None  # noqa
 
-        logger.info("Searching for Resources ...")
-        enqueued_jobs = [
-            *filter(bool, [enqueue_job(i + 1, proxy=get_proxy()) for i in range(MAX_LANDS_TO_SCAN)])
-        ]
-        logger.info(f"Found {len(enqueued_jobs)}")
+        logger.info(f"Searching for Resources on shards {shards} ...")
+
+        for shard in shards:
+            scanned = enqueued = 0
+
+            for land_number in get_shard_lands(shard):
+                if not coordinator.owns(shard):
+                    break
+
+                scanned += 1
+                enqueued += bool(enqueue_job(land_number, proxy=get_proxy()))
+            else:
+                publish_shard_progress(redis, shard, scanned, enqueued)
+
+            logger.info(f"Shard {shard}: found {enqueued}")
+
+        rh.cleanup_registries()
 
 
 def main():
-    logger.info("Starting Resource Hunter Loop")
+    logger.info(f"Starting Resource Hunter Loop [{INSTANCE_ID}]")
 
     if RH_SENTRY_DSN := os.getenv("RH_SENTRY_DSN"):
-        sentry_sdk.init(
-            dsn=RH_SENTRY_DSN,
-            traces_sample_rate=1.0,
-            profiles_sample_rate=1.0,
-        )
+        init_sentry(RH_SENTRY_DSN)
 
     if settings.PW_PROXY_ENABLED:
         if not settings.WEBSHARE_TOKEN:
@@ -69,7 +188,14 @@ def main():
             )
         logger.info("Proxy is enabled")
 
-    _main()
+    redis = RedisSync.from_url(settings.REDIS_URL)
+    coordinator = ShardCoordinator(redis)
+    coordinator.start_heartbeat()
+
+    try:
+        _main(coordinator, redis)
+    finally:
+        coordinator.release_all()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,23 @@
 import os
 from multiprocessing import Process
 
-import redis
-import rq
-import sentry_sdk
+from ..lib.utils import init_sentry
 
-if WORKER_SENTRY_DSN := os.getenv("WORKER_SENTRY_DSN"):
-    sentry_sdk.init(
-        dsn=WORKER_SENTRY_DSN,
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
-    )
+
+def work(redis_url: str):
+    # runs after the fork: every worker owns its sentry client and redis connection
+    import redis
+    import rq
+
+    from ..lib import profiling
+
+    if WORKER_SENTRY_DSN := os.getenv("WORKER_SENTRY_DSN"):
+        init_sentry(WORKER_SENTRY_DSN)
+
+    # load the profiling rates before rq forks a work horse for every job
+    profiling.start_refresher()
+    connection = redis.Redis.from_url(redis_url)
+    rq.worker.Worker(queues=["default"], connection=connection).work()
 
 
 def _main():
@@ -18,11 +25,7 @@ def _main():
         raise Exception("The 'APP_REDIS_URL' environment variable isn`t defined")
 
     concurrency = int(os.getenv("APP_CONCURRENCY", 1))
-    connection = redis.Redis.from_url(redis_url)
-    workers = [
-        rq.worker.Worker(queues=["default"], connection=connection) for _ in range(concurrency)
-    ]
-    processes = [Process(target=w.work, daemon=True) for w in workers]
+    processes = [Process(target=work, args=(redis_url,), daemon=True) for _ in range(concurrency)]
     [p.start() for p in processes]
     [p.join() for p in processes]
 
@@ -1,45 +1,80 @@
 import asyncio
+import json
+import os
 from datetime import datetime, timedelta
 from random import randint
+from typing import TYPE_CHECKING, Literal, TypedDict
 
 import rq
-from playwright.async_api import ProxySettings
+import rq.registry
 from redis import Redis as RedisSync
 
 from .. import settings
+from ..lib import profiling
 from ..lib.pixels import land_state as ls
 from ..lib.redis import create_redis_connection
 
-queue = rq.Queue(connection=RedisSync.from_url(settings.REDIS_URL))
+if TYPE_CHECKING:
+    from playwright.async_api import ProxySettings
 
+_queue: tuple[int, rq.Queue] | None = None
 
-def enqueue(land_number: int, *, proxy: ProxySettings = None) -> rq.job.Job:
-    return queue.enqueue(
+
+def get_queue() -> rq.Queue:
+    # created on first use and again after a fork, so no process shares an inherited connection
+    global _queue
+
+    if _queue is None or _queue[0] != os.getpid():
+        _queue = (os.getpid(), rq.Queue(connection=RedisSync.from_url(settings.REDIS_URL)))
+
+    return _queue[1]
+
+
+def enqueue(land_number: int, *, proxy: "ProxySettings" = None) -> rq.job.Job:
+    return get_queue().enqueue(
         job,
         land_number,
         proxy=proxy,
         job_id=f"app:land:{land_number}:job",
+        result_ttl=settings.RQ_RESULT_TTL,
+        failure_ttl=settings.RQ_FAILURE_TTL,
         on_success=job_success_handler,
         on_failure=job_failure_handler,
     )
 
 
-def job(land_number: int, *, proxy: ProxySettings = None):
+class JobSummary(TypedDict):
+    # what rq keeps as the job result; the state itself lives in `app:land:{n}:state` only
+    landNumber: int
+    createdAt: datetime
+    expiresAt: datetime
+    outcome: Literal["synced", "blocked"]
+
+
+def job(land_number: int, *, proxy: "ProxySettings" = None) -> JobSummary:
     return asyncio.run(_job(land_number, proxy=proxy))
 
 
-async def _job(land_number: int, *, proxy: ProxySettings = None):
-    raw_state = await ls.from_browser(land_number, proxy=proxy)
+@profiling.sampled("job")
+async def _job(land_number: int, *, proxy: "ProxySettings" = None) -> JobSummary:
+    state_str = await ls.from_browser_raw(land_number, proxy=proxy)
+    raw_state = json.loads(state_str)
     seconds_to_expire = get_best_seconds_to_expire(raw_state)
 
     async with create_redis_connection() as redis:
-        cached_state = await ls.to_cache(land_number, raw_state, seconds_to_expire, redis=redis)
-        await ls.publish(land_number, cached_state, redis=redis)
-
-    return cached_state
+        encoded_state = await ls.to_cache(land_number, state_str, seconds_to_expire, redis=redis)
+        await ls.publish(land_number, encoded_state, redis=redis)
+
+    result: JobSummary = {
+        "landNumber": land_number,
+        "createdAt": encoded_state["createdAt"],
+        "expiresAt": encoded_state["expiresAt"],
+        "outcome": "blocked" if raw_state["permissions"]["use"][0] != "ANY" else "synced",
+    }
+    return result
 
 
-def job_success_handler(job: rq.job.Job, connection, result: ls.CachedLandState, *args, **kwargs):
+def job_success_handler(job: rq.job.Job, connection, result: JobSummary, *args, **kwargs):
     expires_at = result["expiresAt"]
     print(f"Land {job.args[0]} next sync at {expires_at!s}.")
 
@@ -49,6 +84,12 @@ def job_failure_handler(job: rq.job.Job, connection, type, value, traceback):
     print(f"Failed to fetch land {job.args[0]} state. Next attempt at {next_attempt!s}.")
 
 
+def cleanup_registries():
+    queue = get_queue()
+    rq.registry.FinishedJobRegistry(queue=queue).cleanup()
+    rq.registry.FailedJobRegistry(queue=queue).cleanup()
+
+
 def get_best_seconds_to_expire(raw_state: dict) -> int:
     if raw_state["permissions"]["use"][0] != "ANY":
         # Land is Blocked
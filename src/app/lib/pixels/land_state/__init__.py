@@ -1,11 +1,18 @@
 from ._core import CachedLandState as CachedLandState
+from ._core import EncodedLandState as EncodedLandState
 from ._core import from_browser as from_browser
+from ._core import from_browser_raw as from_browser_raw
 from ._core import from_cache as from_cache
+from ._core import from_cache_raw as from_cache_raw
+from ._core import merge_fields as merge_fields
 from ._core import publish as publish
 from ._core import to_cache as to_cache
+from ._parser import LandStateParser as LandStateParser
 from ._parser import ParsedLandIndustry as ParsedLandIndustry
 from ._parser import ParsedLandState as ParsedLandState
 from ._parser import ParsedLandTree as ParsedLandTree
 from ._parser import parse as parse
+from ._pool import ParsingService as ParsingService
+from ._pool import parse_encoded as parse_encoded
 
 LandResource = ParsedLandTree | ParsedLandIndustry
@@ -1,16 +1,25 @@
 import json
 from datetime import datetime, timedelta
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
-from fastapi import HTTPException
-from playwright.async_api import Page, ProxySettings, ViewportSize, async_playwright
 from redis.asyncio import Redis
 
 from .... import settings
 from ...utils import retry_until_valid
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page, ProxySettings
+
+
+async def from_browser(land_number: int, *, proxy: "ProxySettings" = None) -> dict:
+    return json.loads(await from_browser_raw(land_number, proxy=proxy))
+
+
+async def from_browser_raw(land_number: int, *, proxy: "ProxySettings" = None) -> str:
+    # playwright and fastapi are only needed by the workers, import them on the first job
+    from fastapi import HTTPException
+    from playwright.async_api import ViewportSize, async_playwright
 
-async def from_browser(land_number: int, *, proxy: ProxySettings = None) -> dict:
     async with async_playwright() as pw:
         browser = await pw.chromium.connect(
             settings.PW_WS_ENDPOINT,
@@ -26,7 +35,7 @@ async def from_browser(land_number: int, *, proxy: ProxySettings = None) -> dict
         page.set_default_timeout(settings.PW_DEFAULT_TIMEOUT)
 
         if not (
-            response := await page.goto(f"https://play.pixels.xyz/pixels/share/{land_number}")
+            response := await page.goto(f"{settings.PIXELS_BASE_URL}/pixels/share/{land_number}")
         ).ok:
             raise HTTPException(
                 422, f"Failed to navigate to the land. [http-code {response.status}]"
@@ -37,7 +46,7 @@ async def from_browser(land_number: int, *, proxy: ProxySettings = None) -> dict
         elif not state_str:
             raise HTTPException(422, "Invalid land state")
 
-    return json.loads(state_str)
+    return state_str
 
 
 class CachedLandState(TypedDict):
@@ -46,31 +55,56 @@ class CachedLandState(TypedDict):
     state: dict
 
 
+class EncodedLandState(TypedDict):
+    createdAt: datetime
+    expiresAt: datetime
+    data: str  # the CachedLandState as a JSON document
+
+
 async def from_cache(land_number: int, *, redis: Redis) -> CachedLandState | None:
-    if cached := await redis.get(f"app:land:{land_number}:state"):
+    if cached := await from_cache_raw(land_number, redis=redis):
         return json.loads(cached)
 
     return None
 
 
-async def to_cache(land_number: int, raw_state: dict, ex: int, *, redis: Redis) -> CachedLandState:
-    result: CachedLandState = {
-        "createdAt": (now := datetime.now()),
-        "expiresAt": now + timedelta(seconds=ex),
-        "state": raw_state,
+async def from_cache_raw(land_number: int, *, redis: Redis) -> str | None:
+    return await redis.get(f"app:land:{land_number}:state")
+
+
+async def to_cache(land_number: int, state: str, ex: int, *, redis: Redis) -> EncodedLandState:
+    # `state` is the JSON document read from the browser; it is embedded as is, never re-encoded
+    created_at = datetime.now()
+    expires_at = created_at + timedelta(seconds=ex)
+    result: EncodedLandState = {
+        "createdAt": created_at,
+        "expiresAt": expires_at,
+        "data": merge_fields(f'{{"state": {state}}}', createdAt=created_at, expiresAt=expires_at),
     }
-    await redis.set(f"app:land:{land_number}:state", json.dumps(result, default=str))
+    await redis.set(f"app:land:{land_number}:state", result["data"])
     return result
 
 
+def merge_fields(data: str, **fields) -> str:
+    # prepends `fields` to the encoded JSON object `data` without decoding it
+    head = ", ".join(f"{json.dumps(k)}: {json.dumps(v, default=str)}" for k, v in fields.items())
+
+    if not head:
+        return data
+    elif (rest := data[1:].lstrip()).startswith("}"):
+        return f"{{{head}{rest}"
+
+    return f"{{{head}, {rest}"
+
+
 @retry_until_valid(tries=settings.PW_DEFAULT_TIMEOUT // 1000)
-async def phaser_land_state_getter(page: Page) -> str:
+async def phaser_land_state_getter(page: "Page") -> str:
     return await page.evaluate(
         "JSON.stringify(Phaser.Display.Canvas.CanvasPool.pool[0].parent.game.scene.scenes[1].stateManager.room.state)",
     )
 
 
-async def publish(land_number: int, state: CachedLandState, *, redis: Redis):
+async def publish(land_number: int, state: EncodedLandState, *, redis: Redis):
     await redis.publish(
-        "app:lands:states:channel", json.dumps({"landNumber": land_number, **state}, default=str)
+        "app:lands:states:channel", merge_fields(state["data"], landNumber=land_number)
     )
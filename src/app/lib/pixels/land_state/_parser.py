@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import TypedDict
 
+from ... import profiling
+
 
 class ParsedLandState(TypedDict):
     land_number: int
@@ -112,5 +114,6 @@ class LandStateParser:
         }
 
 
+@profiling.sampled("parse")
 def parse(raw_state: dict) -> ParsedLandState:
     return LandStateParser.parse(raw_state)
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar
+
+from .... import settings
+from ._parser import ParsedLandState, parse
+
+T = TypeVar("T")
+
+
+def parse_encoded(data: str) -> ParsedLandState:
+    # `data` is a cached value as stored in redis, see `to_cache`
+    return parse(json.loads(data)["state"])
+
+
+def _run_chunk(f: Callable[[str], T], chunk: list[str]) -> list[T]:
+    return [*map(f, chunk)]
+
+
+class ParsingService:
+    # Runs CPU bound work over many encoded land states in a process pool, in chunks, so the
+    # event loop of the caller stays responsive. Inputs travel as the JSON strings read from
+    # redis, which pickle as plain buffers, and are only decoded inside the workers.
+    def __init__(self, max_workers: int | None = None, chunk_size: int | None = None) -> None:
+        self._max_workers = max_workers or settings.PARSING_WORKERS or os.cpu_count()
+        self._chunk_size = chunk_size or settings.PARSING_CHUNK_SIZE
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and other threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                self._max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return self._executor
+
+    async def map(self, f: Callable[[str], T], items: list[str]) -> list[T]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunks = [items[i : i + self._chunk_size] for i in range(0, len(items), self._chunk_size)]
+        results = await asyncio.gather(
+            *[loop.run_in_executor(executor, _run_chunk, f, chunk) for chunk in chunks]
+        )
+        return [_ for chunk in results for _ in chunk]
+
+    async def parse_many(self, items: list[str]) -> list[ParsedLandState]:
+        return await self.map(parse_encoded, items)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable
+
+from redis import Redis as RedisSync
+
+from .. import settings
+
+_RATE_REFRESH_SECONDS = 10
+_redis: tuple[int, RedisSync] | None = None
+_refresher: tuple[int, threading.Thread] | None = None
+_rates: dict[str, int] = {}
+
+
+def _get_redis() -> RedisSync:
+    # one connection per process; never reuse a connection inherited through fork
+    global _redis
+
+    if _redis is None or _redis[0] != os.getpid():
+        _redis = (os.getpid(), RedisSync.from_url(settings.REDIS_URL))
+
+    return _redis[1]
+
+
+def get_every(name: str) -> int:
+    return int(_get_redis().get(f"app:profiling:{name}:every") or 0)
+
+
+def set_every(name: str, every: int):
+    _get_redis().set(f"app:profiling:{name}:every", max(0, every))
+    _rates[name] = max(0, every)
+
+
+def get_collapsed_stacks(name: str) -> str:
+    stacks = _get_redis().hgetall(f"app:profiling:{name}:stacks")
+    return "".join(f"{k.decode()} {int(v)}\n" for k, v in sorted(stacks.items()))
+
+
+def reset(name: str):
+    _get_redis().delete(f"app:profiling:{name}:stacks", f"app:profiling:{name}:calls")
+
+
+def _load_rates():
+    redis = _get_redis()
+    keys = [*redis.scan_iter("app:profiling:*:every")]
+    values = redis.mget(keys) if keys else []
+    rates = {k.decode().split(":")[2]: int(v or 0) for k, v in zip(keys, values)}
+
+    for name in [*_rates]:
+        _rates[name] = rates.pop(name, 0)
+
+    _rates.update(rates)
+
+
+def _refresh_rates():
+    while True:
+        time.sleep(_RATE_REFRESH_SECONDS)
+
+        try:
+            _load_rates()
+        except Exception:
+            pass
+
+
+def start_refresher(load: bool = True):
+    # Keeps `_rates` up to date from a background thread (one per process, threads do not survive
+    # a fork) so calls never wait on redis for it, e.g. on the API event loop. Processes that
+    # fork per task, like rq workers, call it before forking so the children inherit the rates.
+    global _refresher
+
+    if _refresher is not None and _refresher[0] == os.getpid():
+        return
+    elif load:
+        try:
+            _load_rates()
+        except Exception:
+            pass
+
+    _refresher = (os.getpid(), threading.Thread(target=_refresh_rates, daemon=True))
+    _refresher[1].start()
+
+
+def _should_profile(name: str) -> bool:
+    start_refresher(load=False)
+
+    if not (every := _rates.get(name, 0)):
+        return False
+
+    # counted in redis, a process may only ever make one call (e.g. an rq work horse)
+    try:
+        return _get_redis().incr(f"app:profiling:{name}:calls") % every == 0
+    except Exception:
+        return False
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.stacks: Counter[str] = Counter()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            if not (frame := sys._current_frames().get(self._thread_id)):
+                continue
+
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stopped.set()
+        self._thread.join()
+
+
+def _save(name: str, stacks: Counter[str]):
+    try:
+        with _get_redis().pipeline(transaction=False) as pipe:
+            for stack, count in stacks.items():
+                pipe.hincrby(f"app:profiling:{name}:stacks", stack, count)
+            pipe.execute()
+    except Exception:
+        pass
+
+
+def sampled(name: str):
+    # Profiles one of every N calls, N being read from `app:profiling:{name}:every` (0 disables).
+    # Samples are merged into `app:profiling:{name}:stacks` in the collapsed stack format.
+    def wrapper(f: Callable):
+        if asyncio.iscoroutinefunction(f):
+
+            @wraps(f)
+            async def g(*args, **kwargs):
+                if not _should_profile(name):
+                    return await f(*args, **kwargs)
+
+                with StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL) as sampler:
+                    result = await f(*args, **kwargs)
+
+                _save(name, sampler.stacks)
+                return result
+
+        else:
+
+            @wraps(f)
+            def g(*args, **kwargs):
+                if not _should_profile(name):
+                    return f(*args, **kwargs)
+
+                with StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL) as sampler:
+                    result = f(*args, **kwargs)
+
+                _save(name, sampler.stacks)
+                return result
+
+        return g
+
+    return wrapper
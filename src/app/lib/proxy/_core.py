@@ -1,7 +1,10 @@
-from playwright.async_api import ProxySettings
+from typing import TYPE_CHECKING
 
 from . import _webshare as webshare
 
+if TYPE_CHECKING:
+    from playwright.async_api import ProxySettings
+
 
 def create_proxy_yielder():
     def yielder():
@@ -10,11 +13,12 @@ def create_proxy_yielder():
 
         while True:
             for proxy in proxies:
-                yield ProxySettings(
-                    server=f"http://{proxy['proxy_address']}:{proxy['port']}",
-                    username=proxy["username"],
-                    password=proxy["password"],
-                )
+                result: "ProxySettings" = {
+                    "server": f"http://{proxy['proxy_address']}:{proxy['port']}",
+                    "username": proxy["username"],
+                    "password": proxy["password"],
+                }
+                yield result
 
     _yielder = yielder()
     return lambda: next(_yielder)
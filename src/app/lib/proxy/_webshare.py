@@ -1,10 +1,17 @@
-from typing import TypedDict
-
-from httpx import Client
+from functools import cache
+from typing import TYPE_CHECKING, TypedDict
 
 from ... import settings
 
-client = Client(headers={"Authorization": f"Token {settings.WEBSHARE_TOKEN}"})
+if TYPE_CHECKING:
+    from httpx import Client
+
+
+@cache
+def get_client() -> "Client":
+    from httpx import Client
+
+    return Client(headers={"Authorization": f"Token {settings.WEBSHARE_TOKEN}"})
 
 
 class WebshareProxy(TypedDict):
@@ -21,7 +28,7 @@ class WebshareProxy(TypedDict):
 
 
 def fetch_proxy_list() -> list[WebshareProxy]:
-    response = client.get(
+    response = get_client().get(
         "https://proxy.webshare.io/api/v2/proxy/list/?mode=direct&page=1&page_size=25"
     )
     response.raise_for_status()
@@ -3,6 +3,8 @@ import logging
 from datetime import datetime
 from typing import Awaitable
 
+from .. import settings
+
 
 def retry_until_valid(*, tries: int = 10):
     def wrapper(f: Awaitable):
@@ -46,6 +48,19 @@ def parse_datetime(dt: str | datetime | None, dt_fmt: str = "%Y-%m-%d %H:%M:%S")
 def get_logger(name: str) -> logging.Logger:
     result = logging.getLogger(name)
     result.setLevel(logging.INFO)
-    result.addHandler(_ := logging.StreamHandler())
-    _.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+
+    if not result.handlers:
+        result.addHandler(_ := logging.StreamHandler())
+        _.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+
     return result
+
+
+def init_sentry(dsn: str):
+    import sentry_sdk
+
+    sentry_sdk.init(
+        dsn=dsn,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
+        profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
+    )
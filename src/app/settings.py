@@ -24,3 +24,32 @@ try:
     )
 except Exception:
     DISCORD_BOT_TRACK_INDUSTRIES_CHANNEL_ID = None
+
+DISCORD_BOT_BOARD_MODE = bool(int(os.getenv("APP_DISCORD_BOT_BOARD_MODE", 0)))
+DISCORD_BOT_SEND_RATE = float(os.getenv("APP_DISCORD_BOT_SEND_RATE", 0.5))  # messages per second
+DISCORD_BOT_SEND_BURST = int(os.getenv("APP_DISCORD_BOT_SEND_BURST", 5))
+
+RH_SHARDS = int(os.getenv("APP_RH_SHARDS", 1))
+RH_LEASE_TTL = int(os.getenv("APP_RH_LEASE_TTL", 30000))  # 30 seconds
+
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("APP_SENTRY_TRACES_SAMPLE_RATE", 0.05))
+SENTRY_PROFILES_SAMPLE_RATE = float(os.getenv("APP_SENTRY_PROFILES_SAMPLE_RATE", 0.05))
+PROFILING_INTERVAL = float(os.getenv("APP_PROFILING_INTERVAL", 0.005))  # 5 milliseconds
+PROFILING_TOKEN = os.getenv("APP_PROFILING_TOKEN", "")  # the API profiling routes need it
+
+PIXELS_BASE_URL = os.getenv("APP_PIXELS_BASE_URL", "https://play.pixels.xyz")
+RH_MAX_LANDS = int(os.getenv("APP_RH_MAX_LANDS", 5000))
+
+API_WS_PER_MESSAGE_DEFLATE = bool(int(os.getenv("APP_API_WS_PER_MESSAGE_DEFLATE", 1)))
+# 128 KiB per land holds one version of every land in, e.g., raw msgpack (~47 KB), raw cbor
+# (~48 KB) and both parsed projections (~5 KB each); 625 MiB for 5000 lands
+API_FRAMES_CACHE_MAX_BYTES = int(
+    os.getenv("APP_API_FRAMES_CACHE_MAX_BYTES") or RH_MAX_LANDS * 128 * 2**10
+)
+API_CLIENT_BUFFER_MAX_BYTES = int(os.getenv("APP_API_CLIENT_BUFFER_MAX_BYTES", 16 * 2**20))
+
+RQ_RESULT_TTL = int(os.getenv("APP_RQ_RESULT_TTL", 518400))  # 6 days, above the longest expiry
+RQ_FAILURE_TTL = int(os.getenv("APP_RQ_FAILURE_TTL", 3600))  # 1 hour
+
+PARSING_WORKERS = int(os.getenv("APP_PARSING_WORKERS", 0))  # 0 means one per cpu
+PARSING_CHUNK_SIZE = int(os.getenv("APP_PARSING_CHUNK_SIZE", 100))
@@ -0,0 +1,37 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from src.app.api import _hub, controllers
+from src.app.lib.pixels import land_state as ls
+
+
+@pytest.fixture
+def redis_server(monkeypatch) -> fakeredis.FakeServer:
+    server = fakeredis.FakeServer()
+
+    @asynccontextmanager
+    async def create_redis_connection():
+        yield fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    monkeypatch.setattr(controllers, "create_redis_connection", create_redis_connection)
+    monkeypatch.setattr(_hub, "create_redis_connection", create_redis_connection)
+    return server
+
+
+@pytest.fixture
+def cache_lands(redis_server):
+    def cache_lands(land_numbers):
+        async def run():
+            redis = fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True)
+
+            for land_number in land_numbers:
+                await ls.to_cache(land_number, json.dumps({"id": land_number}), 3600, redis=redis)
+
+        asyncio.run(run())
+
+    return cache_lands
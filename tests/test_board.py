@@ -0,0 +1,47 @@
+from src.app.cli.start_discord_bot._board import (
+    EMBED_DESCRIPTION_LIMIT,
+    MESSAGE_EMBEDS_CHARS_LIMIT,
+    MESSAGE_EMBEDS_LIMIT,
+    build_pages,
+    chunk_lines,
+    digest_page,
+)
+
+
+def test_chunk_lines_respects_the_limit():
+    lines = [f"line {i}" for i in range(100)]
+    chunks = chunk_lines(lines, limit=50)
+
+    assert all(len(_) <= 50 for _ in chunks)
+    assert "\n".join(chunks).split("\n") == lines
+
+
+def test_chunk_lines_truncates_long_lines():
+    assert chunk_lines(["x" * 10, "y" * 3], limit=5) == ["xxxxx", "yyy"]
+    assert chunk_lines([]) == []
+
+
+def test_build_pages_respects_the_embed_limits():
+    lines = ["x" * 1000 for _ in range(100)]
+    pages = build_pages("Trees", lines)
+
+    assert sum(len(page) for page in pages) == len(chunk_lines(lines))
+
+    for page in pages:
+        assert len(page) <= MESSAGE_EMBEDS_LIMIT
+        assert sum(len(_.title) + len(_.description) for _ in page) <= MESSAGE_EMBEDS_CHARS_LIMIT
+        assert all(len(_.description) <= EMBED_DESCRIPTION_LIMIT for _ in page)
+
+
+def test_build_pages_without_lines_has_a_placeholder():
+    [[embed]] = build_pages("Trees", [])
+    assert embed.title == "Trees (1/1)"
+
+
+def test_digest_page_changes_with_the_content():
+    assert digest_page(build_pages("Trees", ["a"])[0]) == digest_page(
+        build_pages("Trees", ["a"])[0]
+    )
+    assert digest_page(build_pages("Trees", ["a"])[0]) != digest_page(
+        build_pages("Trees", ["b"])[0]
+    )
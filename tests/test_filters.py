@@ -0,0 +1,83 @@
+import asyncio
+import json
+from pathlib import Path
+
+import fakeredis.aioredis
+import pytest
+
+from src.app.api._filters import LandFilter
+from src.app.api._stream import ProtocolError
+from src.app.lib.pixels import land_state as ls
+
+EXAMPLE_STATE = (Path(__file__).parents[1] / "docs" / "land-state-example.json").read_text()
+
+
+@pytest.fixture(scope="module")
+def cached_example() -> str:
+    async def run():
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        state = json.dumps(json.loads(EXAMPLE_STATE)["state"])
+        await ls.to_cache(667, state, 3600, redis=redis)
+        return await ls.from_cache_raw(667, redis=redis)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [1],
+        "lands",
+        {"lands": 12},
+        {"lands": ["12"]},
+        {"lands": [True]},
+        {"lands": [[1]]},
+        {"lands": [[1, 2, 3]]},
+        {"lands": [[1, "2"]]},
+        {"lands": [[10, 1]]},
+        {"resources": "trees"},
+        {"resources": [["trees"]]},
+        {"resources": ["rocks"]},
+        {"readyWithin": True},
+        {"readyWithin": "60"},
+        {"readyWithin": -1},
+        {"readyWithin": float("inf")},
+        {"excludeBlocked": 1},
+    ],
+)
+def test_invalid_specs_raise_protocol_errors(spec):
+    with pytest.raises(ProtocolError):
+        LandFilter(spec)
+
+
+@pytest.mark.parametrize("ready_within", [0, 60, 60.5])
+def test_ready_within_accepts_numbers(ready_within):
+    assert LandFilter({"readyWithin": ready_within}).ready_within == ready_within
+
+
+def test_equivalent_specs_share_a_key():
+    a = LandFilter({"lands": [250, [1, 100]], "resources": ["trees", "kilns", "trees"]})
+    b = LandFilter({"lands": [[1, 100], [250, 250]], "resources": ["kilns", "trees"]})
+    assert a.key == b.key
+    assert a.key != LandFilter({"lands": [[1, 100]]}).key
+
+
+def test_iter_land_numbers_merges_overlapping_ranges():
+    land_filter = LandFilter({"lands": [[3, 5], 1, [4, 7], 6]})
+    assert [*land_filter.iter_land_numbers()] == [1, 3, 4, 5, 6, 7]
+    assert len([*LandFilter().iter_land_numbers()]) == 5000
+
+
+def test_match_land_numbers_without_parsing():
+    land_filter = LandFilter({"lands": [[1, 3], 10]})
+    assert not land_filter.needs_parsing
+    assert [_ for _ in range(1, 12) if land_filter.match(_, "not parsed")] == [1, 2, 3, 10]
+
+
+def test_match_resources(cached_example):
+    assert LandFilter().match(667, cached_example)
+    assert LandFilter({"resources": ["windmills"]}).match(667, cached_example)
+    assert LandFilter({"resources": ["trees"], "readyWithin": 0}).match(667, cached_example)
+    assert LandFilter({"excludeBlocked": True}).match(667, cached_example)
+    assert not LandFilter({"resources": ["kilns"]}).match(667, cached_example)
+    assert not LandFilter({"lands": [1], "resources": ["trees"]}).match(667, cached_example)
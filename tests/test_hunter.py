@@ -0,0 +1,55 @@
+import time
+
+import fakeredis
+import pytest
+
+from src.app import settings
+from src.app.cli import start_resource_hunter as hunter
+from src.app.lib.lease import Lease
+
+
+@pytest.mark.parametrize("max_lands,shards", [(5000, 1), (5000, 3), (10, 4), (3, 5)])
+def test_shards_cover_every_land_once(monkeypatch, max_lands, shards):
+    monkeypatch.setattr(hunter, "MAX_LANDS_TO_SCAN", max_lands)
+    monkeypatch.setattr(settings, "RH_SHARDS", shards)
+
+    lands = [_ for shard in range(shards) for _ in hunter.get_shard_lands(shard)]
+    assert lands == [*range(1, max_lands + 1)]
+
+
+def test_lease_has_a_single_owner():
+    redis = fakeredis.FakeRedis()
+    a = Lease(redis, "lease", "a", 10000)
+    b = Lease(redis, "lease", "b", 10000)
+
+    assert a.acquire()
+    assert not b.acquire()
+    assert not b.renew()
+    assert not b.release()
+    assert a.renew()
+    assert a.release()
+    assert b.acquire()
+
+
+def test_lease_renew_extends_the_ttl():
+    redis = fakeredis.FakeRedis()
+    lease = Lease(redis, "lease", "a", 10000)
+
+    assert lease.acquire()
+    redis.pexpire("lease", 10)
+    assert lease.renew()
+    assert redis.pttl("lease") > 1000
+
+
+def test_coordinator_takes_a_fair_share(monkeypatch):
+    monkeypatch.setattr(settings, "RH_SHARDS", 4)
+    redis = fakeredis.FakeRedis()
+    redis.zadd("app:hunter:instances", {"other": time.time() * 1000})
+    coordinator = hunter.ShardCoordinator(redis)
+
+    coordinator.heartbeat()
+    assert coordinator.owned() == [0, 1]
+
+    coordinator.release_all()
+    assert coordinator.owned() == []
+    assert redis.keys("app:hunter:shard:*:lease") == []
@@ -0,0 +1,44 @@
+import asyncio
+import json
+from datetime import datetime
+
+import fakeredis.aioredis
+
+from src.app.lib.pixels import land_state as ls
+
+
+def test_merge_fields_prepends_fields():
+    data = json.dumps({"state": {"id": 1}})
+    merged = ls.merge_fields(data, type="update", landNumber=1)
+
+    assert merged.startswith('{"type": "update", "landNumber": 1, ')
+    assert json.loads(merged) == {"type": "update", "landNumber": 1, "state": {"id": 1}}
+
+
+def test_merge_fields_edge_cases():
+    assert json.loads(ls.merge_fields("{}", a=1)) == {"a": 1}
+    assert ls.merge_fields('{"a": 1}') == '{"a": 1}'
+    assert json.loads(ls.merge_fields("{}", at=datetime(2024, 4, 1))) == {
+        "at": "2024-04-01 00:00:00"
+    }
+
+
+def test_to_cache_embeds_the_state_unchanged():
+    state = '{"id":667,"nested":{"b":1,"a":[1,2]}}'
+
+    async def run():
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        encoded = await ls.to_cache(667, state, 60, redis=redis)
+        return (
+            encoded,
+            await ls.from_cache_raw(667, redis=redis),
+            await ls.from_cache(667, redis=redis),
+        )
+
+    encoded, raw, cached = asyncio.run(run())
+
+    assert raw == encoded["data"]
+    assert raw.endswith(f'"state": {state}}}')
+    assert cached["state"] == json.loads(state)
+    assert cached["createdAt"] == str(encoded["createdAt"])
+    assert cached["expiresAt"] == str(encoded["expiresAt"])
@@ -0,0 +1,63 @@
+import os
+import socket
+import threading
+
+import fakeredis
+import pytest
+
+from src.app import settings
+from src.app.lib import profiling
+
+
+@pytest.fixture
+def redis_url(monkeypatch):
+    # a real socket, so forked processes share the redis state with the test
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    server = fakeredis.TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(settings, "REDIS_URL", f"redis://127.0.0.1:{port}/0")
+    monkeypatch.setattr(profiling, "_redis", None)
+    monkeypatch.setattr(profiling, "_refresher", None)
+    monkeypatch.setattr(profiling, "_rates", {})
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def call_in_fork(f) -> bool:
+    if (pid := os.fork()) == 0:
+        os._exit(int(bool(f())))
+
+    return bool(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]))
+
+
+def test_every_nth_call_is_profiled_across_forked_processes(redis_url):
+    profiling.set_every("job", 2)
+    profiling._rates.clear()
+    # what a worker does before rq forks a work horse per job
+    profiling.start_refresher()
+
+    profiled = [call_in_fork(lambda: profiling._should_profile("job")) for _ in range(6)]
+    assert profiled == [False, True] * 3
+
+
+def test_sampled_saves_stacks_from_a_forked_process(redis_url, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL", 0.001)
+    profiling.set_every("job", 1)
+
+    @profiling.sampled("job")
+    def job():
+        return sum(i * i for i in range(10**6))
+
+    call_in_fork(job)
+    assert "job (test_profiling.py)" in profiling.get_collapsed_stacks("job")
+
+
+def test_disabled_profiling_does_not_count_calls(redis_url):
+    profiling.start_refresher()
+
+    assert not any(profiling._should_profile("parse") for _ in range(5))
+    assert profiling._get_redis().get("app:profiling:parse:calls") is None
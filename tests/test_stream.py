@@ -0,0 +1,237 @@
+import asyncio
+import json
+from pathlib import Path
+
+import cbor2
+import fakeredis.aioredis
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import settings
+from src.app.api._filters import LandFilter
+from src.app.api._hub import StreamClient
+from src.app.api._stream import (
+    LEGACY_PROTOCOL,
+    FrameCache,
+    ProtocolError,
+    encode_frame,
+    frame_cache,
+    get_parsed,
+    parse_handshake,
+)
+from src.app.api.asgi import app
+from src.app.lib.pixels import land_state as ls
+from src.app.lib.pixels.land_state import _pool
+
+EXAMPLE_STATE = (Path(__file__).parents[1] / "docs" / "land-state-example.json").read_text()
+
+
+def receive_message(ws) -> dict:
+    return json.loads(ws.receive_text())["message"]
+
+
+def test_resubscribe_only_sends_the_new_subscription_after_the_ack(cache_lands):
+    cache_lands([*range(1, 301), 1000, 1001])
+
+    with TestClient(app) as client, client.websocket_connect("/lands/states/stream/") as ws:
+        ws.send_text(json.dumps({"subscribe": {"lands": [[1, 300]]}}))
+        assert receive_message(ws)["type"] == "hello"
+        assert receive_message(ws)["landNumber"] == 1
+
+        ws.send_text(json.dumps({"subscribe": {"lands": [[1000, 1001]]}}))
+
+        while (message := receive_message(ws))["type"] != "subscribed":
+            assert message["type"] == "cached"
+
+        assert message["subscription"] == {"lands": [[1000, 1001]]}
+        assert [receive_message(ws)["landNumber"] for _ in range(2)] == [1000, 1001]
+
+
+def test_invalid_resubscribe_keeps_the_previous_subscription(cache_lands):
+    cache_lands([1, 2])
+
+    with TestClient(app) as client, client.websocket_connect("/lands/states/stream/") as ws:
+        ws.send_text(json.dumps({"subscribe": {"lands": [1]}}))
+        assert receive_message(ws)["type"] == "hello"
+        assert receive_message(ws)["landNumber"] == 1
+
+        ws.send_text(json.dumps({"subscribe": {"resources": [["trees"]]}}))
+        assert receive_message(ws)["type"] == "error"
+
+        ws.send_text(json.dumps({"subscribe": {"lands": [2]}}))
+        assert receive_message(ws)["type"] == "subscribed"
+        assert receive_message(ws)["landNumber"] == 2
+
+
+def test_invalid_handshake_subscription_is_reported():
+    with TestClient(app) as client, client.websocket_connect("/lands/states/stream/") as ws:
+        ws.send_text(json.dumps({"subscribe": {"lands": ["12"]}}))
+        assert receive_message(ws)["type"] == "error"
+
+
+def test_frame_cache_evicts_the_least_recently_used_frames():
+    cache = FrameCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") == cache.get("c") == b"1234"
+
+    cache.put("a", b"123456789")
+    assert cache.get("c") is None
+    assert cache.get("a") == b"123456789"
+
+
+def test_parse_handshake():
+    assert parse_handshake("1") == (LEGACY_PROTOCOL, None)
+    assert parse_handshake("hello") is None
+    assert parse_handshake('{"encoding": "cbor", "subscribe": {"lands": [1]}}') == (
+        {"encoding": "cbor", "projection": "raw"},
+        {"lands": [1]},
+    )
+
+    with pytest.raises(ProtocolError):
+        parse_handshake('{"encoding": "xml"}')
+
+    with pytest.raises(ProtocolError):
+        parse_handshake('{"projection": "everything"}')
+
+
+def test_encode_frame():
+    data = '{"createdAt": "2024-04-01 00:00:00", "expiresAt": "2024-04-01 01:00:00", "state": {}}'
+    legacy = json.loads(encode_frame(LEGACY_PROTOCOL, "cached", data, 7))
+    binary = msgpack.unpackb(
+        encode_frame({"encoding": "msgpack", "projection": "raw"}, "cached", data, 7)
+    )
+
+    assert legacy == {"message": {"type": "cached", "landNumber": 7, **json.loads(data)}}
+    assert binary == legacy
+
+
+@pytest.mark.parametrize(
+    "protocol,dumps",
+    [
+        ({"encoding": "msgpack", "projection": "raw"}, msgpack.packb),
+        ({"encoding": "cbor", "projection": "raw"}, cbor2.dumps),
+        ({"encoding": "json", "projection": "parsed"}, lambda _: json.dumps(_, default=str)),
+    ],
+)
+def test_cached_and_update_frames_share_one_encoding(protocol, dumps):
+    data = ls.merge_fields(
+        EXAMPLE_STATE, createdAt="2024-04-01 00:00:02", expiresAt="2024-04-01 01:00:00"
+    )
+    size = len(frame_cache._frames)
+
+    cached = encode_frame(protocol, "cached", data, 8)
+    update = encode_frame(protocol, "update", data, 8)
+    message = {
+        "landNumber": 8,
+        "createdAt": "2024-04-01 00:00:02",
+        "expiresAt": "2024-04-01 01:00:00",
+    }
+
+    if protocol["projection"] == "raw":
+        message["state"] = json.loads(EXAMPLE_STATE)["state"]
+    else:
+        message["resources"] = json.loads(json.dumps(get_parsed(data, 8), default=str))
+
+    assert len(frame_cache._frames) == size + 1
+    assert cached == dumps({"message": {"type": "cached", **message}})
+    assert update == dumps({"message": {"type": "update", **message}})
+
+
+def test_updates_wait_for_the_snapshot_and_keep_the_latest_per_land():
+    async def run():
+        client = StreamClient(LEGACY_PROTOCOL, LandFilter())
+        client.begin_snapshot("ack")
+        received = []
+
+        async def consume():
+            while (frame := await client.next_frame()) != "done":
+                received.append(frame)
+                await asyncio.sleep(0)
+
+        async def snapshot():
+            for i in range(3000):
+                await client.put_snapshot(f"cached {i}")
+
+                if i % 100 == 0:
+                    # an update published mid-snapshot, the same lands over and over
+                    client.push(i % 3, f"update {i % 3} {i}")
+
+            client.end_snapshot()
+            client.push(99, "done")
+
+        await asyncio.gather(consume(), snapshot())
+        return client, received
+
+    client, received = asyncio.run(run())
+
+    assert not client.lagging.is_set()
+    assert received[0] == "ack"
+    assert received[1 : 3000 + 1] == [f"cached {i}" for i in range(3000)]
+    assert received[3000 + 1 :] == ["update 0 2700", "update 1 2800", "update 2 2900"]
+
+
+def test_updates_beyond_the_buffer_size_mark_the_client_as_lagging(monkeypatch):
+    monkeypatch.setattr(settings, "API_CLIENT_BUFFER_MAX_BYTES", 1000)
+    client = StreamClient(LEGACY_PROTOCOL, LandFilter())
+    client.begin_snapshot()
+
+    for land_number in range(9):
+        client.push(land_number, "x" * 100)
+
+    client.push(0, "x" * 200)
+    assert not client.lagging.is_set()
+
+    client.push(10, "x" * 100)
+    assert client.lagging.is_set() and client.dropped == 1
+
+
+def test_update_published_during_the_snapshot_follows_it(redis_server, cache_lands):
+    cache_lands(range(1, 301))
+
+    async def publish():
+        redis = fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True)
+        encoded = await ls.to_cache(5, json.dumps({"id": "new"}), 3600, redis=redis)
+        await ls.publish(5, encoded, redis=redis)
+
+    with TestClient(app) as client, client.websocket_connect("/lands/states/stream/") as ws:
+        ws.send_text("1")
+        assert receive_message(ws)["landNumber"] == 1
+        asyncio.run(publish())
+
+        cached = [receive_message(ws) for _ in range(299)]
+        update = receive_message(ws)
+
+    assert {_["type"] for _ in cached} == {"cached"}
+    assert len({_["landNumber"] for _ in cached}) == 299
+    assert (update["type"], update["landNumber"], update["state"]) == ("update", 5, {"id": "new"})
+
+
+def test_snapshot_parses_states_in_the_parsing_pool(redis_server, monkeypatch):
+    state = json.dumps(json.loads(EXAMPLE_STATE)["state"])
+
+    async def cache_example_lands():
+        redis = fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True)
+
+        for land_number in (1, 2):
+            await ls.to_cache(land_number, state, 3600, redis=redis)
+
+    def parse_on_the_event_loop(state):
+        raise AssertionError("parsed on the event loop")
+
+    asyncio.run(cache_example_lands())
+    monkeypatch.setattr(ls, "parse", parse_on_the_event_loop)
+    monkeypatch.setattr(_pool, "parse", parse_on_the_event_loop)
+
+    with TestClient(app) as client, client.websocket_connect("/lands/states/stream/") as ws:
+        ws.send_text(json.dumps({"subscribe": {"resources": ["kilns"]}}))
+        assert receive_message(ws)["type"] == "hello"
+
+        ws.send_text(json.dumps({"subscribe": {"resources": ["windmills"]}}))
+        assert receive_message(ws)["type"] == "subscribed"
+        assert [receive_message(ws)["landNumber"] for _ in range(2)] == [1, 2]